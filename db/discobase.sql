@@ -192,6 +192,33 @@ CREATE TABLE "subtasks"
 	FOREIGN KEY("conversationid") REFERENCES "conversations"("id")
 );
 
+DROP TABLE IF EXISTS "vocabulary";
+CREATE TABLE "vocabulary"
+(
+	"term" TEXT,
+	-- lowercased word from dialogue, alternates, actors, variables, conversation titles and skills
+	"frequency" INT DEFAULT 0,
+	PRIMARY KEY("term")
+) WITHOUT ROWID;
+
+DROP TABLE IF EXISTS "buildinfo";
+CREATE TABLE "buildinfo"
+(
+	"key" TEXT,
+	-- input_hash, schema_hash, parser_hash, database_hash
+	"value" TEXT DEFAULT null,
+	PRIMARY KEY("key")
+);
+
+DROP TABLE IF EXISTS "tablehashes";
+CREATE TABLE "tablehashes"
+(
+	"tablename" TEXT,
+	"rowcount" INT DEFAULT 0,
+	"hash" TEXT DEFAULT null,
+	PRIMARY KEY("tablename")
+);
+
 DROP INDEX IF EXISTS "idx_dentry_conversation";
 CREATE INDEX "idx_dentry_conversation" ON "dentries"("conversationid");
 
@@ -3,12 +3,16 @@
 Parse Disco Elysium.json into a SQLite3 database.
 Converts the Unity dialogue JSON export into a normalized SQL database.
 """
+from abc import ABC, abstractmethod
 from encodings.punycode import T
+from collections import Counter
 from enum import Enum
+import hashlib
 import json
 import re
 import sqlite3
 import sys
+import unicodedata
 from pathlib import Path
 import logging
 
@@ -39,6 +43,336 @@ def drop_all_tables(db_path: str):
     connection.close()
 
 
+# Tables that describe the build itself and are left out of the content fingerprint
+FINGERPRINT_EXCLUDED_TABLES = ("buildinfo", "tablehashes")
+
+# Tables built from the finished database rather than parsed rows, so only the SQLite output has them
+SINK_EXCLUDED_TABLES = ("vocabulary", "buildinfo", "tablehashes")
+
+# Words for the search autocomplete: letters/digits with inner apostrophes or hyphens (don't, half-light)
+VOCABULARY_TOKEN_PATTERN = re.compile(r"[^\W_]+(?:['’\-][^\W_]+)*")
+VOCABULARY_SOURCES = {
+    "dialogue": "SELECT dialoguetext FROM dentries",
+    "alternates": "SELECT alternateline FROM alternates",
+    "actors": "SELECT name FROM actors",
+    "variables": "SELECT name FROM variables",
+    "conversations": "SELECT displayTitle FROM conversations",
+    "skills": "SELECT a.name FROM checks c JOIN actors a ON a.articyId = c.skilltype",
+}
+
+
+def hash_file(path) -> str:
+    """Return the sha256 hex digest of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_source_hashes(json_path, schema_path) -> dict:
+    """Hash everything that determines the build output: input JSON, schema and this parser."""
+    return {
+        "input_hash": hash_file(json_path),
+        "schema_hash": hash_file(schema_path),
+        "parser_hash": hash_file(__file__),
+    }
+
+
+def build_outputs_current(db_path, database_hash: str) -> bool:
+    """Check that the version manifest and diff report next to the database were written for database_hash."""
+    db_path = Path(db_path)
+    try:
+        with open(db_path.with_suffix(".version.json"), 'r', encoding='utf-8') as f:
+            version = json.load(f).get("version")
+        with open(db_path.with_suffix(".diff.json"), 'r', encoding='utf-8') as f:
+            diff_hash = json.load(f).get("databaseHash")
+    except (OSError, ValueError, AttributeError):
+        return False
+    return version == database_hash and diff_hash == database_hash
+
+
+def read_build_metadata(db_path) -> dict | None:
+    """Read buildinfo and tablehashes from a previous build, or None if there is no usable build."""
+    if not Path(db_path).exists():
+        return None
+    connection = sqlite3.connect(str(db_path))
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SELECT key, value FROM buildinfo")
+        info = dict(cursor.fetchall())
+        cursor.execute("SELECT tablename, rowcount, hash FROM tablehashes")
+        tables = {name: {"rowcount": rowcount, "hash": table_hash}
+                  for name, rowcount, table_hash in cursor.fetchall()}
+        if not info.get("database_hash"):
+            return None
+        return {"info": info, "tables": tables}
+    except sqlite3.Error:
+        return None
+    finally:
+        connection.close()
+
+
+def read_schema(schema_path) -> dict[str, list[tuple[str, str, object]]]:
+    """
+    Return {table: [(column, declared type, default value), ...]} by loading the schema into an
+    in-memory database.
+    """
+    connection = sqlite3.connect(":memory:")
+    try:
+        with open(schema_path, 'r', encoding='utf-8') as f:
+            connection.executescript(f.read())
+        tables = [name for (name,) in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY name;")]
+        schema = {}
+        for table in tables:
+            columns = connection.execute(f'PRAGMA table_info("{table}")').fetchall()
+            schema[table] = [(row[1], row[2].upper(), evaluate_default(connection, row[4]))
+                             for row in columns]
+        return schema
+    finally:
+        connection.close()
+
+
+def evaluate_default(connection: sqlite3.Connection, default_sql: str | None) -> object:
+    """Turn a column's DEFAULT expression from PRAGMA table_info into the value SQLite would store."""
+    if default_sql is None:
+        return None
+    try:
+        return connection.execute(f"SELECT {default_sql}").fetchone()[0]
+    except sqlite3.Error:
+        return default_sql.strip('"\'')
+
+
+def fill_defaults(table: str, schema_columns: list[tuple[str, str, object]], columns: list[str],
+                  rows: list[tuple]) -> list[tuple]:
+    """
+    Expand rows to every schema column, using the declared default for columns the stage didn't write.
+    Column names match case-insensitively like they do in SQLite; a column missing from the schema is an error.
+    """
+    schema_names = {name.lower() for name, _, _ in schema_columns}
+    unknown = [name for name in columns if name.lower() not in schema_names]
+    if unknown:
+        raise ValueError(f"{table} has no column {', '.join(unknown)}")
+    positions = {name.lower(): i for i, name in enumerate(columns)}
+    picks = [(positions.get(name.lower()), default) for name, _, default in schema_columns]
+    return [tuple(row[index] if index is not None else default for index, default in picks)
+            for row in rows]
+
+
+class RowSink(ABC):
+    """
+    Destination for parsed rows.
+    Sinks get rows in batches per table; a batch shares one column list.
+    replace marks rows that were INSERT OR REPLACE upserts, append-only sinks write them as is.
+    """
+
+    def open(self, schema: dict[str, list[tuple[str, str, object]]]):
+        """Called once before any rows with the columns, declared types and defaults of every table."""
+
+    @abstractmethod
+    def write_batch(self, table: str, columns: list[str], rows: list[tuple], replace: bool = False):
+        """Write rows whose values follow columns."""
+
+    def flush(self):
+        """Called at the end of each parse stage, after all its rows were written."""
+
+    def close(self):
+        """Called once when parsing finishes."""
+
+
+class SqliteSink(RowSink):
+    """Insert rows through an open connection. Commits are left to the parse stages."""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+
+    def write_batch(self, table, columns, rows, replace=False):
+        column_names = ", ".join(columns)
+        placeholders = ", ".join("?" for _ in columns)
+        verb = "INSERT OR REPLACE" if replace else "INSERT"
+        self.connection.executemany(
+            f"{verb} INTO {table} ({column_names}) VALUES ({placeholders})", rows)
+
+
+class JsonLinesSink(RowSink):
+    """Write one <table>.jsonl file per table, one JSON object per row with every schema column."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.columns = {}
+        self.files = {}
+
+    def open(self, schema):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for table, columns in schema.items():
+            self.columns[table] = columns
+            self.files[table] = open(self.directory / f"{table}.jsonl", 'w', encoding='utf-8')
+
+    def write_batch(self, table, columns, rows, replace=False):
+        f = self.files[table]
+        names = [name for name, _, _ in self.columns[table]]
+        # SQLite stores BOOL as 0/1, written as JSON true/false whether parsed or defaulted
+        booleans = [declared_type in ("BOOL", "BOOLEAN") for _, declared_type, _ in self.columns[table]]
+        for row in fill_defaults(table, self.columns[table], columns, rows):
+            values = [bool(v) if is_bool and v is not None else v for v, is_bool in zip(row, booleans)]
+            f.write(json.dumps(dict(zip(names, values)), ensure_ascii=False))
+            f.write("\n")
+
+    def flush(self):
+        for f in self.files.values():
+            f.flush()
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+        self.files = {}
+
+
+def coerce_column(values: list, declared_type: str) -> list:
+    """
+    Convert values to the Python type that matches a column's declared SQLite type.
+    SQLite accepts anything in any column, a typed columnar file does not.
+    """
+    if declared_type in ("INT", "INTEGER"):
+        kind = int
+    elif declared_type in ("BOOL", "BOOLEAN"):
+        kind = bool
+    elif declared_type in ("REAL", "FLOAT", "DOUBLE", "NUMERIC"):
+        kind = float
+    else:
+        kind = str
+
+    coerced = []
+    for value in values:
+        if value is None:
+            coerced.append(None)
+        elif kind is str:
+            coerced.append(value if isinstance(value, str) else str(value))
+        elif kind is bool:
+            coerced.append(bool(value))
+        elif kind is float:
+            coerced.append(float(value))
+        elif isinstance(value, bool):
+            coerced.append(int(value))
+        elif isinstance(value, int):
+            coerced.append(value)
+        elif isinstance(value, float) and value.is_integer():
+            coerced.append(int(value))
+        elif isinstance(value, str) and value.strip().lstrip("-").isdigit():
+            coerced.append(int(value))
+        else:
+            raise ValueError(f"Cannot store {value!r} in a {declared_type} column")
+    return coerced
+
+
+class ParquetSink(RowSink):
+    """
+    Write one <table>.parquet file per table, typed from the schema.
+    Every batch becomes a row group, so memory stays bounded by the batch size.
+    Requires pyarrow.
+    """
+
+    ARROW_TYPES = {
+        "INT": "int64", "INTEGER": "int64",
+        "BOOL": "bool_", "BOOLEAN": "bool_",
+        "REAL": "float64", "FLOAT": "float64", "DOUBLE": "float64", "NUMERIC": "float64",
+    }
+
+    def __init__(self, directory):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow)") from e
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+        self.directory = Path(directory)
+        self.columns = {}
+        self.schemas = {}
+        self.writers = {}
+
+    def open(self, schema):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for table, columns in schema.items():
+            self.columns[table] = columns
+            self.schemas[table] = self.pa.schema([
+                (name, getattr(self.pa, self.ARROW_TYPES.get(declared_type, "string"))())
+                for name, declared_type, _ in columns])
+
+    def write_batch(self, table, columns, rows, replace=False):
+        rows = fill_defaults(table, self.columns[table], columns, rows)
+        arrays = []
+        for i, ((name, declared_type, _), field) in enumerate(zip(self.columns[table], self.schemas[table])):
+            values = [row[i] for row in rows]
+            try:
+                arrays.append(self.pa.array(coerce_column(values, declared_type), type=field.type))
+            except ValueError as e:
+                raise ValueError(f"{table}.{name}: {e}") from e
+
+        writer = self.writers.get(table)
+        if writer is None:
+            writer = self.pq.ParquetWriter(str(self.directory / f"{table}.parquet"), self.schemas[table])
+            self.writers[table] = writer
+        writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schemas[table]))
+
+    def close(self):
+        for writer in self.writers.values():
+            writer.close()
+        # Tables that got no rows still get a file with their schema
+        for table, schema in self.schemas.items():
+            if table not in self.writers:
+                self.pq.write_table(schema.empty_table(), str(self.directory / f"{table}.parquet"))
+        self.writers = {}
+
+
+class MultiSink:
+    """
+    Fan rows out to several sinks in one pass.
+    Rows are buffered per table and column list, and every sink gets the buffered batches
+    once buffer_rows rows are pending or a stage calls flush().
+    """
+
+    def __init__(self, sinks: list[RowSink], buffer_rows: int = 5000):
+        self.sinks = sinks
+        self.buffer_rows = buffer_rows
+        self.buffers = {}
+        self.pending = 0
+
+    def open(self, schema):
+        for sink in self.sinks:
+            sink.open(schema)
+
+    def write(self, table: str, row: dict, replace: bool = False):
+        key = (table, tuple(row.keys()), replace)
+        self.buffers.setdefault(key, []).append(tuple(row.values()))
+        self.pending += 1
+        if self.pending >= self.buffer_rows:
+            self._write_buffers()
+
+    def _write_buffers(self):
+        for (table, columns, replace), rows in self.buffers.items():
+            for sink in self.sinks:
+                sink.write_batch(table, list(columns), rows, replace)
+        self.buffers = {}
+        self.pending = 0
+
+    def flush(self):
+        self._write_buffers()
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self):
+        # Rows still buffered here belong to a stage that failed and rolled back
+        self.buffers = {}
+        self.pending = 0
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                logger.error(f"Error closing {type(sink).__name__}: {e}")
+
+
 class TypeString(Enum):
     DEFAULT = 0
     CustomFieldType_Number = 1
@@ -49,11 +383,20 @@ class TypeString(Enum):
 class DiscoDBParser:
     """Parser for Disco Elysium JSON dialogue data into SQLite."""
 
-    def __init__(self, json_path: str, schema_path: str, db_path: str):
-        """Initialize parser with input JSON and output database paths."""
+    def __init__(self, json_path: str, schema_path: str, db_path: str, previous_build: dict | None = None,
+                 sinks: list[RowSink] | None = None):
+        """
+        Initialize parser with input JSON and output database paths.
+        sinks are extra outputs (JSON Lines, Parquet) that receive every parsed row alongside the database.
+        """
         self.json_path = Path(json_path)
         self.db_path = Path(db_path)
         self.schema_path = Path(schema_path)
+        self.diff_report_path = self.db_path.with_suffix(".diff.json")
+        self.version_path = self.db_path.with_suffix(".version.json")
+        self.previous_build = previous_build
+        self.extra_sinks = sinks or []
+        self.sink: MultiSink | None = None
         self.connection: sqlite3.Connection
         self.cursor: sqlite3.Cursor
         self.data: dict
@@ -129,7 +472,7 @@ class DiscoDBParser:
             'inputId': lambda entry, fields: self._get_field_value(fields, 'InputId'),
             'forced': lambda entry, fields: self._parse_bool(self._get_field_value(fields, 'Forced')),
             'menuText': lambda entry, fields: self._get_field_value(fields, 'Menu Text'),
-            'flagname': lambda entry, fields: self._get_field_value(fields, 'FlagName'),
+            'flagName': lambda entry, fields: self._get_field_value(fields, 'FlagName'),
             'isGroup': lambda entry, fields:  self._parse_bool(entry.get('isGroup')),
             'conditionstring': lambda entry, fields:  entry.get('conditionsString'),
             'userscript': lambda entry, fields:  entry.get('userScript')
@@ -155,14 +498,13 @@ class DiscoDBParser:
         return None
 
     # Insert single row, for objects like actors, dialogues, and items
-    def insert_row(self, table: str, field_map: dict, json_obj: dict):
+    def insert_row(self, table: str, field_map: dict, json_obj: dict, extra: dict | None = None):
         fields = json_obj.get("fields", [])
-        column_names = ", ".join(field_map.keys())
-        placeholders = ", ".join("?" for _ in field_map)
-        sql = f"INSERT OR REPLACE INTO {table} ({column_names}) VALUES ({placeholders})"
-        values = [func(json_obj, fields) for func in field_map.values()]
-        if (self.cursor is not None):
-            self.cursor.execute(sql, values)
+        row = {column: func(json_obj, fields) for column, func in field_map.items()}
+        if extra:
+            row.update(extra)
+        if (self.sink is not None):
+            self.sink.write(table, row, replace=True)
 
     def executeScriptsFromFile(self):
         """Load and parse the SQL schema file."""
@@ -191,14 +533,8 @@ class DiscoDBParser:
             return False
 
     def insert_item(self, table: str, item: dict):
-        keys = list(item.keys())
-        cols = ", ".join(keys)
-        placeholders = ", ".join(["?"] * len(keys))
-        values = list(item.values())
-
-        sql = f"INSERT INTO {table} ({cols}) VALUES ({placeholders})"
-        self.connection.execute(sql, values)
-        self.connection.commit()
+        if (self.sink is not None):
+            self.sink.write(table, item)
 
     def clean_conversation_titles(self, title, convo_type) -> str:
         display_title = ""
@@ -250,6 +586,12 @@ class DiscoDBParser:
             # Read and execute schema
             self.executeScriptsFromFile()
             self.connection.commit()
+
+            # Every parse stage streams its rows into the database and any extra sinks
+            self.sink = MultiSink([SqliteSink(self.connection), *self.extra_sinks])
+            schema = read_schema(self.schema_path)
+            self.sink.open({table: columns for table, columns in schema.items()
+                            if table not in SINK_EXCLUDED_TABLES})
             logger.info("Database tables created successfully")
             return True
         except Exception as e:
@@ -328,6 +670,7 @@ class DiscoDBParser:
             for actor in actors:
                 self.insert_row("actors", self.ACTOR_FIELD_MAP, actor)
 
+            self.sink.flush()
             self.connection.commit()
             logger.info(f"Successfully inserted {len(actors)} actors")
             return True
@@ -348,6 +691,7 @@ class DiscoDBParser:
             for item in items:
                 self.insert_row("items", self.ITEM_DATA_MAP, item)
 
+            self.sink.flush()
             self.connection.commit()
             logger.info(f"Successfully inserted {len(items)} items")
             return True
@@ -368,6 +712,7 @@ class DiscoDBParser:
             for variable in variables:
                 self.insert_row("variables", self.VARIABLE_MAP, variable)
 
+            self.sink.flush()
             self.connection.commit()
             logger.info(f"Successfully inserted {len(variables)} variables")
             return True
@@ -413,11 +758,7 @@ class DiscoDBParser:
                 # Parse subtasks - Multiple per conversation if task
                 for block in subtasks_blocks:
                     if block.get("name") is not None or block.get("displayCondition") is not None or block.get("doneCondition") is not None or block.get("cancelCondition") is not None:
-                        self.cursor.execute("""
-                            INSERT INTO subtasks
-                            (id, conversationid, name, isTimed, displayCondition, doneCondition, cancelCondition)
-                            VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """, (block.get("id"), block.get("conversationid"), block.get("name"), block.get("isTimed"), block.get("displayCondition"), block.get("doneCondition"), block.get("cancelCondition")))
+                        self.insert_item("subtasks", block)
                         total_subtasks += 1
 
                 display_condition_main = self._get_field_value(
@@ -461,16 +802,9 @@ class DiscoDBParser:
                     'isHidden': self.mark_conversations_hidden(title, description),
                 }
 
-                self.cursor.execute("""
-                    INSERT OR REPLACE INTO conversations 
-                    (id, title, articyId, onUse, overrideDialogueCondition, alternateOrbText, checkType, 
-                     condition, instruction, placement, difficulty, description, actor, conversant, 
-                     displayConditionMain, doneConditionMain, cancelConditionMain, taskReward, taskTimed,
-                     type, totalSubtasks, displayTitle, isHidden
-                     )
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, tuple(convo_data.values()))
+                self.sink.write("conversations", convo_data, replace=True)
 
+            self.sink.flush()
             self.connection.commit()
             logger.info(
                 f"Successfully inserted {len(conversations)} conversations")
@@ -505,8 +839,6 @@ class DiscoDBParser:
                     entry_alternates = 0
                     entry_modifiers = 0
 
-                    self.insert_row("dentries", self.DIALOGUE_ENTRY_MAP, entry)
-
                     alternate_blocks = []
                     for i in range(1, 5):
                         alternate_blocks.append({
@@ -530,20 +862,28 @@ class DiscoDBParser:
                     # Parse alternates - Multiple per entry
                     for block in alternate_blocks:
                         if block["alternate"] is not None or block["condition"] is not None:
-                            self.cursor.execute("""
-                                INSERT INTO alternates (id, conversationid, dialogueid, alternateline, condition, replaces)
-                                VALUES (?, ?, ?, ?, ?, ?)
-                            """, (block["id"], convo_id, entry_id, block["alternate"], block["condition"], dialogue_text))
+                            self.insert_item("alternates", {
+                                "id": block["id"],
+                                "conversationid": convo_id,
+                                "dialogueid": entry_id,
+                                "alternateline": block["alternate"],
+                                "condition": block["condition"],
+                                "replaces": dialogue_text,
+                            })
                             entry_alternates += 1
                             total_alternates += 1
 
                     # Parse modifiers - Multiple per entry
                     for block in modifier_blocks:
                         if block["modifier"] is not None or block["variable"] is not None or block["tooltip"] is not None:
-                            self.cursor.execute("""
-                                INSERT INTO modifiers (id, conversationid, dialogueid, modifier, variable, tooltip)
-                                VALUES (?, ?, ?, ?, ?, ?)
-                            """, (block["id"], convo_id, entry_id, block["modifier"], block["variable"], block["tooltip"]))
+                            self.insert_item("modifiers", {
+                                "id": block["id"],
+                                "conversationid": convo_id,
+                                "dialogueid": entry_id,
+                                "modifier": block["modifier"],
+                                "variable": block["variable"],
+                                "tooltip": block["tooltip"],
+                            })
                             entry_modifiers += 1
                             total_modifiers += 1
 
@@ -568,39 +908,50 @@ class DiscoDBParser:
 
                     # Update to switch statement, only one can be true at once
                     if difficultypassive is not None:
-                        self.cursor.execute("""
-                            INSERT INTO checks
-                            (conversationid, dialogueid, checktype, skilltype, check_target, difficulty)
-                            VALUES (?, ?, ?, ?, ?, ?)
-                        """, (convo_id, entry_id, 'passive', skilltype, check_target, difficultypassive))
+                        self.insert_item("checks", {
+                            "conversationid": convo_id,
+                            "dialogueid": entry_id,
+                            "checktype": 'passive',
+                            "skilltype": skilltype,
+                            "check_target": check_target,
+                            "difficulty": difficultypassive,
+                        })
                         entry_checks += 1
                         total_passive_checks += 1
 
                     if difficultywhite is not None:
-                        self.cursor.execute("""
-                            INSERT INTO checks
-                            (conversationid, dialogueid, checktype, skilltype, check_target, difficulty)
-                            VALUES (?, ?, ?, ?, ?, ?)
-                        """, (convo_id, entry_id, 'white', skilltype, check_target, difficultywhite))
+                        self.insert_item("checks", {
+                            "conversationid": convo_id,
+                            "dialogueid": entry_id,
+                            "checktype": 'white',
+                            "skilltype": skilltype,
+                            "check_target": check_target,
+                            "difficulty": difficultywhite,
+                        })
                         entry_checks += 1
                         total_white_checks += 1
 
                     if difficultyred is not None:
-                        self.cursor.execute("""
-                            INSERT INTO checks
-                            (conversationid, dialogueid, checktype, skilltype, check_target, difficulty)
-                            VALUES (?, ?, ?, ?, ?, ?)
-                        """, (convo_id, entry_id, 'red', skilltype, check_target, difficultyred))
+                        self.insert_item("checks", {
+                            "conversationid": convo_id,
+                            "dialogueid": entry_id,
+                            "checktype": 'red',
+                            "skilltype": skilltype,
+                            "check_target": check_target,
+                            "difficulty": difficultyred,
+                        })
                         entry_checks += 1
                         total_red_checks += 1
 
-                    self.cursor.execute("""
-                            UPDATE dentries
-                            SET hasAlts = ?, hasCheck = ?, totalModifiers = ?
-                            WHERE conversationid = ? and id = ?
-                        """, (entry_alternates > 0, entry_checks > 0, entry_modifiers, convo_id, entry_id))
+                    # Written last so the row already carries its alternate, check and modifier counts
+                    self.insert_row("dentries", self.DIALOGUE_ENTRY_MAP, entry, {
+                        "hasAlts": entry_alternates > 0,
+                        "hasCheck": entry_checks > 0,
+                        "totalModifiers": entry_modifiers,
+                    })
                     total_entries += 1
 
+            self.sink.flush()
             self.connection.commit()
             logger.info(
                 f"Successfully inserted {total_entries} dialogue entries")
@@ -745,6 +1096,180 @@ class DiscoDBParser:
             self.connection.rollback()
             return False
 
+    def build_vocabulary(self) -> bool:
+        """
+        Collect lowercased terms and their frequencies into the vocabulary table.
+        The table is keyed on term so the client can answer prefix lookups with an index range scan.
+        """
+        if self.connection is None or self.cursor is None:
+            return False
+        try:
+            logger.info("Building search vocabulary...")
+            frequencies = Counter()
+            for source, sql in VOCABULARY_SOURCES.items():
+                self.cursor.execute(sql)
+                for (text,) in self.cursor.fetchall():
+                    if not text:
+                        continue
+                    text = str(text).lower()
+                    for term in VOCABULARY_TOKEN_PATTERN.findall(text):
+                        if len(term) > 1 and not term.isdigit():
+                            frequencies[term] += 1
+                    # Variable names are searched as a whole (Variable["whirling.sandwich"])
+                    if source == "variables":
+                        frequencies[text] += 1
+
+            self.cursor.execute("DELETE FROM vocabulary")
+            self.cursor.executemany(
+                "INSERT INTO vocabulary (term, frequency) VALUES (?, ?)", sorted(frequencies.items()))
+            self.connection.commit()
+            logger.info(f"Successfully inserted {len(frequencies)} vocabulary terms")
+            return True
+        except Exception as e:
+            logger.error(f"Error building vocabulary: {e}")
+            self.connection.rollback()
+            return False
+
+    def _normalize_value(self, value):
+        """Normalize a column value so equal content always hashes the same."""
+        if isinstance(value, bool):
+            return int(value)
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        if isinstance(value, str):
+            return unicodedata.normalize("NFC", value)
+        if isinstance(value, bytes):
+            return value.hex()
+        return value
+
+    def _hash_table(self, table: str) -> tuple[int, str]:
+        """
+        Hash a table independent of row order.
+        Each row is hashed on its own, the row hashes are sorted and hashed
+        together with the column names.
+        """
+        self.cursor.execute(f'SELECT * FROM "{table}"')
+        columns = [d[0] for d in self.cursor.description]
+        row_hashes = []
+        for row in self.cursor.fetchall():
+            normalized = [self._normalize_value(v) for v in row]
+            encoded = json.dumps(normalized, ensure_ascii=False, separators=(',', ':'))
+            row_hashes.append(hashlib.sha256(encoded.encode('utf-8')).hexdigest())
+        row_hashes.sort()
+
+        digest = hashlib.sha256()
+        digest.update(json.dumps(columns).encode('utf-8'))
+        for row_hash in row_hashes:
+            digest.update(row_hash.encode('ascii'))
+        return len(row_hashes), digest.hexdigest()
+
+    def compute_fingerprints(self) -> bool:
+        """Store per-table hashes and a whole-database hash in buildinfo/tablehashes."""
+        if self.connection is None or self.cursor is None:
+            return False
+        try:
+            logger.info("Computing content fingerprints...")
+            self.cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY name;")
+            tables = [name for (name,) in self.cursor.fetchall()
+                      if name not in FINGERPRINT_EXCLUDED_TABLES]
+
+            self.table_hashes = {}
+            database_digest = hashlib.sha256()
+            for table in tables:
+                rowcount, table_hash = self._hash_table(table)
+                self.table_hashes[table] = {"rowcount": rowcount, "hash": table_hash}
+                database_digest.update(f"{table}:{table_hash}\n".encode('utf-8'))
+            # Schema objects too, so index or DDL-only changes still get a new hash
+            self.cursor.execute("SELECT type, name, sql FROM sqlite_master ORDER BY type, name")
+            for row in self.cursor.fetchall():
+                database_digest.update(json.dumps(row).encode('utf-8'))
+            self.database_hash = database_digest.hexdigest()
+
+            self.cursor.execute("DELETE FROM tablehashes")
+            self.cursor.executemany(
+                "INSERT INTO tablehashes (tablename, rowcount, hash) VALUES (?, ?, ?)",
+                [(t, h["rowcount"], h["hash"]) for t, h in self.table_hashes.items()])
+
+            build_info = build_source_hashes(self.json_path, self.schema_path)
+            build_info["database_hash"] = self.database_hash
+            self.cursor.execute("DELETE FROM buildinfo")
+            self.cursor.executemany(
+                "INSERT INTO buildinfo (key, value) VALUES (?, ?)", build_info.items())
+
+            self.connection.commit()
+            logger.info(f"Database fingerprint: {self.database_hash}")
+            return True
+        except Exception as e:
+            logger.error(f"Error computing fingerprints: {e}")
+            self.connection.rollback()
+            return False
+
+    def write_diff_report(self) -> bool:
+        """Compare table hashes against the previous build and write a per-table diff report."""
+        try:
+            previous_tables = self.previous_build["tables"] if self.previous_build else {}
+            previous_hash = self.previous_build["info"].get("database_hash") if self.previous_build else None
+
+            tables = {}
+            for table in sorted(set(previous_tables) | set(self.table_hashes)):
+                before = previous_tables.get(table)
+                after = self.table_hashes.get(table)
+                if before is None:
+                    status = "added"
+                elif after is None:
+                    status = "removed"
+                elif before["hash"] == after["hash"]:
+                    status = "unchanged"
+                else:
+                    status = "changed"
+                tables[table] = {
+                    "status": status,
+                    "rowsBefore": before["rowcount"] if before else None,
+                    "rowsAfter": after["rowcount"] if after else None,
+                }
+
+            report = {
+                "changed": previous_hash != self.database_hash,
+                "previousDatabaseHash": previous_hash,
+                "databaseHash": self.database_hash,
+                "tables": tables,
+            }
+            with open(self.diff_report_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+
+            for table, entry in tables.items():
+                if entry["status"] != "unchanged":
+                    logger.info(
+                        f"{table}: {entry['status']} ({entry['rowsBefore']} -> {entry['rowsAfter']} rows)")
+            if report["changed"]:
+                logger.info(f"Content changed, diff report written to {self.diff_report_path}")
+            else:
+                logger.info("Content unchanged since previous build")
+            return True
+        except Exception as e:
+            logger.error(f"Error writing diff report: {e}")
+            return False
+
+    def write_version_manifest(self) -> bool:
+        """
+        Stamp the build with its content hash so clients can cache the database per version.
+        Reordered or otherwise identical exports keep the same version.
+        """
+        try:
+            manifest = {
+                "version": self.database_hash,
+                "database": self.db_path.name,
+                "size": self.db_path.stat().st_size,
+            }
+            with open(self.version_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2)
+            logger.info(f"Version manifest written to {self.version_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Error writing version manifest: {e}")
+            return False
+
     def parse(self) -> bool:
         """Run the complete parsing process."""
         try:
@@ -781,6 +1306,20 @@ class DiscoDBParser:
             if not self.calculate_conversations_entry_count():
                 return False
 
+            # Build the autocomplete vocabulary
+            if not self.build_vocabulary():
+                return False
+
+            # Fingerprint content and report what changed since the previous build
+            if not self.compute_fingerprints():
+                return False
+
+            if not self.write_diff_report():
+                return False
+
+            if not self.write_version_manifest():
+                return False
+
             logger.info("=" * 60)
             logger.info("✓ Parsing complete!")
             logger.info("=" * 60)
@@ -793,12 +1332,26 @@ class DiscoDBParser:
             self.close()
 
     def close(self):
-        """Close database connection."""
+        """Close output sinks and the database connection."""
+        if self.sink:
+            self.sink.close()
+            self.sink = None
         if self.connection:
             self.connection.close()
             logger.info("Database connection closed")
 
 
+def get_option(name: str) -> str | None:
+    """Return the value following a command line flag, or None. Exits if the flag has no value."""
+    if name not in sys.argv:
+        return None
+    index = sys.argv.index(name)
+    if index + 1 >= len(sys.argv) or sys.argv[index + 1].startswith("--"):
+        logger.error(f"{name} needs a directory")
+        sys.exit(1)
+    return sys.argv[index + 1]
+
+
 def main():
     json_path = "D:\\Disco Elysium\\Source Code\\extractDiscoDb\\Disco Elysium.json"
     schema_sql_path = "D:\\Disco Elysium\\Source Code\\DiscoBrowser\\db\\discobase.sql"
@@ -809,8 +1362,31 @@ def main():
         logger.error(f"Input file not found: {json_path}")
         sys.exit(1)
 
+    # Extra outputs written in the same pass: --jsonl <dir> and/or --parquet <dir>
+    sinks = []
+    try:
+        if get_option("--jsonl"):
+            sinks.append(JsonLinesSink(get_option("--jsonl")))
+        if get_option("--parquet"):
+            sinks.append(ParquetSink(get_option("--parquet")))
+    except ImportError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+    # Skip the rebuild when nothing that feeds the build has changed
+    previous_build = read_build_metadata(db_path)
+    if previous_build and not sinks and "--force" not in sys.argv:
+        source_hashes = build_source_hashes(json_path, schema_sql_path)
+        if all(previous_build["info"].get(k) == v for k, v in source_hashes.items()):
+            # buildinfo is committed before the report and manifest are written, so a run that failed
+            # writing them must not count as done
+            if build_outputs_current(db_path, previous_build["info"]["database_hash"]):
+                logger.info("Input, schema and parser unchanged since previous build, skipping")
+                sys.exit(0)
+            logger.info("Version manifest or diff report missing or stale, rebuilding")
+
     drop_all_tables(db_path)
-    parser = DiscoDBParser(json_path, schema_sql_path, db_path)
+    parser = DiscoDBParser(json_path, schema_sql_path, db_path, previous_build, sinks)
     success = parser.parse()
     sys.exit(0 if success else 1)
 
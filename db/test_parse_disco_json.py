@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Smoke tests for the parser's output sinks.
+Run from the repository root with: python -m unittest discover db
+"""
+import importlib.util
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from parse_disco_json import (  # noqa: E402
+    SINK_EXCLUDED_TABLES,
+    JsonLinesSink,
+    MultiSink,
+    ParquetSink,
+    read_schema,
+)
+
+SCHEMA_PATH = Path(__file__).parent / "discobase.sql"
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+# Subtasks as parse_conversations writes them: isHidden is left to its schema default
+SUBTASKS = [
+    {"id": i, "conversationid": 7, "name": f"Subtask {i}", "isTimed": i == 2,
+     "displayCondition": None, "doneCondition": None, "cancelCondition": None}
+    for i in range(1, 4)
+]
+
+# Keys differ in case from the schema's flagName/hasAlts, which SQLite accepts
+DENTRY = {"id": 2, "conversationid": 1, "flagname": "SOME_FLAG", "hasalts": True}
+
+
+def sink_schema() -> dict:
+    return {table: columns for table, columns in read_schema(SCHEMA_PATH).items()
+            if table not in SINK_EXCLUDED_TABLES}
+
+
+def stream_rows(sink) -> None:
+    """Stream SUBTASKS and DENTRY through a MultiSink small enough to flush mid-stage."""
+    multi = MultiSink([sink], buffer_rows=2)
+    multi.open(sink_schema())
+    for row in SUBTASKS:
+        multi.write("subtasks", row)
+    multi.write("dentries", DENTRY, replace=True)
+    multi.flush()
+    multi.close()
+
+
+class JsonLinesSinkTest(unittest.TestCase):
+
+    def test_rows_include_schema_defaults(self):
+        with tempfile.TemporaryDirectory() as directory:
+            stream_rows(JsonLinesSink(directory))
+
+            with open(Path(directory) / "subtasks.jsonl", encoding="utf-8") as f:
+                rows = [json.loads(line) for line in f]
+            self.assertEqual(len(rows), 3)
+            self.assertEqual([row["isHidden"] for row in rows], [False, False, False])
+            self.assertEqual(rows[1]["isTimed"], True)
+            self.assertTrue((Path(directory) / "items.jsonl").exists())
+
+    def test_columns_match_case_insensitively(self):
+        with tempfile.TemporaryDirectory() as directory:
+            stream_rows(JsonLinesSink(directory))
+
+            with open(Path(directory) / "dentries.jsonl", encoding="utf-8") as f:
+                (row,) = [json.loads(line) for line in f]
+            self.assertEqual(row["flagName"], "SOME_FLAG")
+            self.assertIs(row["hasAlts"], True)
+            self.assertIs(row["hasCheck"], False)
+            self.assertNotIn("flagname", row)
+
+    def test_unknown_column_raises(self):
+        with tempfile.TemporaryDirectory() as directory:
+            sink = JsonLinesSink(directory)
+            sink.open(sink_schema())
+            with self.assertRaises(ValueError):
+                sink.write_batch("dentries", ["id", "flagnames"], [(1, "x")])
+            sink.close()
+
+
+@unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+class ParquetSinkTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        import pyarrow.parquet as pq
+
+        with tempfile.TemporaryDirectory() as directory:
+            stream_rows(ParquetSink(directory))
+
+            table = pq.read_table(Path(directory) / "subtasks.parquet")
+            self.assertEqual(table.num_rows, 3)
+            self.assertEqual(table.column("id").to_pylist(), [1, 2, 3])
+            self.assertEqual(table.column("isTimed").to_pylist(), [False, True, False])
+            self.assertEqual(table.column("isHidden").to_pylist(), [False, False, False])
+
+            dentries = pq.read_table(Path(directory) / "dentries.parquet").to_pylist()
+            self.assertEqual(dentries[0]["flagName"], "SOME_FLAG")
+            self.assertEqual(dentries[0]["hasAlts"], True)
+
+            # Tables that got no rows still get a file with their schema
+            items = pq.read_table(Path(directory) / "items.parquet")
+            self.assertEqual(items.num_rows, 0)
+            self.assertIn("name", items.column_names)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,4 +4,5 @@ import { defineConfig } from "eslint/config";
 
 export default defineConfig([
   { files: ["**/*.{js,mjs,cjs}"], plugins: { js }, extends: ["js/recommended"], languageOptions: { globals: globals.browser } },
+  { files: ["js/sqlWorker.js"], languageOptions: { sourceType: "script", globals: globals.worker } },
 ]);
@@ -30,7 +30,7 @@ export async function boot() {
 
   const SQL = await loadSqlJs();
   await initDatabase(SQL, "db/discobase.sqlite3");
-  buildConvoTreeAndRender();
+  await buildConvoTreeAndRender();
   setUpNavigation();
   setUpFilterDropdowns();
   setupClearFiltersBtn();
@@ -18,6 +18,7 @@ export const typeCheckboxList = $("typeCheckboxList");
 export const selectAllTypes = $("selectAllTypes");
 export const searchLoader = $("searchLoader");
 export const searchInput = $("search");
+export const searchSuggestionsList = $("searchSuggestions");
 export const homePageContainer = $("homePageContainer");
 export const dialogueContent = $("dialogueContent");
 
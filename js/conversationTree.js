@@ -23,9 +23,9 @@ let convos = [];
 let activeTypeFilter = "all";
 let conversationTree = null;
 
-export function rebuildConversationTree() {
+export async function rebuildConversationTree() {
   // Rebuild tree to reflect hidden/title settings. Used in userSettings.js only
-  initializeConversationsForTree();
+  await initializeConversationsForTree();
   conversationTree = buildTitleTree(convos);
   renderTree(convoListEl, conversationTree);
   if (getCurrentConvoId() !== null) {
@@ -66,9 +66,9 @@ export function highlightConversationInTree(convoId) {
 export function getConvos() {
   return convos;
 }
-export function buildConvoTreeAndRender() {
+export async function buildConvoTreeAndRender() {
   // Used in boot
-  initializeConversationsForTree();
+  await initializeConversationsForTree();
   conversationTree = buildTitleTree(convos);
   renderTree(convoListEl, conversationTree);
   setUpConversationListEvents();
@@ -597,8 +597,8 @@ function setUpConversationListEvents() {
   // Handle custom convoLeafClick events from tree builder
   convoListEl?.addEventListener("convoLeafClick", handleNavigateToConvoLeaf);
 }
-function initializeConversationsForTree() {
-  convos = getAllConversations(showHidden());
+async function initializeConversationsForTree() {
+  convos = await getAllConversations(showHidden());
 }
 function setupConversationFilter() {
   // Text search filter
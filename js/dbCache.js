@@ -0,0 +1,132 @@
+// Keeps the database bytes in IndexedDB, keyed by the build version from discobase.version.json.
+// Repeat visits open the cached copy straight away and look for a newer build in the background.
+
+const IDB_NAME = "discobrowser";
+const IDB_STORE = "databases";
+
+export async function loadDatabaseBytes(path) {
+  // Returns an ArrayBuffer with the database, from cache when possible
+  const versionPath = path.replace(/\.sqlite3$/, ".version.json");
+  const cached = await readCachedDatabase().catch((err) => {
+    console.warn("Database cache unavailable", err);
+    return null;
+  });
+
+  if (cached) {
+    scheduleIdle(() => refreshCachedDatabase(path, versionPath, cached.version));
+    return cached.bytes;
+  }
+
+  const version = await fetchVersion(versionPath);
+  const bytes = await fetchDatabase(path, version);
+  if (version) {
+    // Not awaited: boot shouldn't wait on the IndexedDB write
+    saveDatabase(version, bytes).catch((err) => console.warn("Failed to cache database", err));
+  }
+  return bytes;
+}
+async function refreshCachedDatabase(path, versionPath, cachedVersion) {
+  // Download a newer build for the next visit; the current session keeps the cached copy
+  try {
+    const version = await fetchVersion(versionPath);
+    if (!version || version === cachedVersion) return;
+    const bytes = await fetchDatabase(path, version);
+    await saveDatabase(version, bytes);
+    console.info(`Database ${version} downloaded, it will be used on next load`);
+  } catch (err) {
+    console.warn("Background database update failed", err);
+  }
+}
+async function fetchVersion(versionPath) {
+  // A missing manifest (older builds, local dev) just disables caching
+  try {
+    const res = await fetch(versionPath, { cache: "no-cache" });
+    if (!res.ok) return null;
+    const manifest = await res.json();
+    return manifest?.version || null;
+  } catch {
+    return null;
+  }
+}
+async function fetchDatabase(path, version) {
+  // Version in the query string so HTTP caches can't serve a stale build
+  const url = version ? `${path}?v=${encodeURIComponent(version)}` : path;
+  const res = await fetch(url);
+  if (!res.ok) throw new Error(`Failed to fetch ${path}: ${res.status}`);
+  return res.arrayBuffer();
+}
+async function saveDatabase(version, bytes) {
+  // Store the new version, then evict every other one. Quota errors just skip caching.
+  if (typeof indexedDB === "undefined") return;
+  // Snapshot before the first await, the caller may transfer the ArrayBuffer to the worker meanwhile
+  const blob = new Blob([bytes]);
+  let db = null;
+  try {
+    db = await openCache();
+    await runTransaction(db, "readwrite", (store) => {
+      store.put({ version, bytes: blob, savedAt: Date.now() }, version);
+    });
+    await runTransaction(db, "readwrite", (store) => {
+      const request = store.openKeyCursor();
+      request.onsuccess = () => {
+        const cursor = request.result;
+        if (!cursor) return;
+        if (cursor.key !== version) store.delete(cursor.key);
+        cursor.continue();
+      };
+    });
+  } catch (err) {
+    if (err?.name === "QuotaExceededError") {
+      console.warn("Storage quota denied, database will not be cached", err);
+    } else {
+      console.warn("Failed to cache database", err);
+    }
+  } finally {
+    db?.close();
+  }
+}
+async function readCachedDatabase() {
+  // Newest stored version, or null
+  if (typeof indexedDB === "undefined") return null;
+  const db = await openCache();
+  let newest = null;
+  await runTransaction(db, "readonly", (store) => {
+    const request = store.openCursor();
+    request.onsuccess = () => {
+      const cursor = request.result;
+      if (!cursor) return;
+      if (!newest || cursor.value.savedAt > newest.savedAt) newest = cursor.value;
+      cursor.continue();
+    };
+  });
+  db.close();
+  if (newest?.bytes instanceof Blob) {
+    newest.bytes = await newest.bytes.arrayBuffer();
+  }
+  return newest;
+}
+function openCache() {
+  return new Promise((resolve, reject) => {
+    const request = indexedDB.open(IDB_NAME, 1);
+    request.onupgradeneeded = () => request.result.createObjectStore(IDB_STORE);
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+    request.onblocked = () => reject(new Error("Database cache blocked"));
+  });
+}
+function runTransaction(db, mode, callback) {
+  return new Promise((resolve, reject) => {
+    const tx = db.transaction(IDB_STORE, mode);
+    tx.oncomplete = () => resolve();
+    tx.onerror = () => reject(tx.error);
+    tx.onabort = () => reject(tx.error);
+    callback(tx.objectStore(IDB_STORE));
+  });
+}
+function scheduleIdle(callback) {
+  if (typeof requestIdleCallback === "function") {
+    requestIdleCallback(callback, { timeout: 5000 });
+  } else {
+    setTimeout(callback, 2000);
+  }
+}
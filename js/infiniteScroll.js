@@ -3,7 +3,8 @@ import { toggleElementVisibility } from "./uiHelpers.js";
 import { search } from "./search.js";
 
 // Search pagination state
-let currentSearchOffset = 0;
+let currentSearchOffset = 0; // Number of rows loaded so far
+let currentSearchCursor = null; // Keyset cursor for the next page, null starts a new query
 let currentSearchTotal = 0;
 let currentSearchFilteredCount = 0; // Count after type filtering
 let isLoadingMore = false;
@@ -11,6 +12,8 @@ let currentSearchActorIds = null;
 
 export function setCurrentSearchOffset(value) {
   currentSearchOffset = value;
+  // Going back to the start also restarts the keyset cursor
+  if (value === 0) currentSearchCursor = null;
 }
 export function setCurrentSearchTotal(value) {
   currentSearchTotal = value;
@@ -53,6 +56,12 @@ export function incrementCurrentSearchFilteredCount(value) {
 export function getCurrentSearchFilteredCount() {
   return currentSearchFilteredCount;
 }
+export function setCurrentSearchCursor(value) {
+  currentSearchCursor = value;
+}
+export function getCurrentSearchCursor() {
+  return currentSearchCursor;
+}
 export function setCurrentSearchActorIds(value) {
   currentSearchActorIds = value;
 }
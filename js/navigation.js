@@ -443,18 +443,21 @@ function updateBackButtonState() {
     }
   }
 }
-function loadChildOptions(convoId, entryId) {
+async function loadChildOptions(convoId, entryId) {
   try {
-    entryListHeaderEl.textContent = "Next Dialogue Options";
-    entryListEl.innerHTML = "";
-
-    const { children } = getParentsChildren(convoId, entryId);
+    const { children } = await getParentsChildren(convoId, entryId);
 
     const pairs = [];
     for (const c of children)
       pairs.push({ convoId: c.d_convo, entryId: c.d_id });
 
-    const destRows = getEntriesBulk(pairs, showHidden());
+    const destRows = await getEntriesBulk(pairs, showHidden());
+
+    // Skip rendering if the user already moved on to another entry
+    if (convoId !== currentConvoId || entryId !== currentEntryId) return;
+
+    entryListHeaderEl.textContent = "Next Dialogue Options";
+    entryListEl.innerHTML = "";
     const destMap = new Map(destRows.map((r) => [`${r.convo}:${r.id}`, r]));
 
     for (const c of children) {
@@ -563,7 +566,7 @@ async function jumpToHistoryPoint(targetIndex) {
     }
 
     // Load child options
-    loadChildOptions(currentConvoId, currentEntryId);
+    await loadChildOptions(currentConvoId, currentEntryId);
 
     // Show details if expanded
     if (moreDetailsEl && moreDetailsEl.open) {
@@ -775,7 +778,7 @@ async function navigateToEntry(
   updateMobileNavButtons();
 
   // Load child options
-  loadChildOptions(convoId, entryId);
+  await loadChildOptions(convoId, entryId);
 
   // Show details lazily only when expanded
   if (moreDetailsEl && moreDetailsEl.open) {
@@ -24,12 +24,14 @@ import {
   getCurrentSearchTotal,
   getCurrentSearchFilteredCount,
   getCurrentSearchActorIds,
+  getCurrentSearchCursor,
   getCurrentSearchOffset,
   getIsLoadingMore,
   setCurrentSearchFilteredCount,
   setCurrentSearchTotal,
   setCurrentSearchOffset,
   setCurrentSearchActorIds,
+  setCurrentSearchCursor,
   setIsLoadingMore,
   incrementCurrentSearchFilteredCount,
   incrementCurrentSearchOffset,
@@ -45,6 +47,7 @@ const searchResultLimit = 50;
 let currentSearchRawResults = [];
 let currentSearchConvoIds = null;
 let totalResultsCount;
+let searchAbortController = null;
 
 export function applyFiltersToCurrentResults(useMobile = false) {
   const rawQuery = searchInput?.value ?? "";
@@ -115,12 +118,11 @@ export function hideSearchCount() {
     toggleElementVisibility(element, false);
   });
 }
-export function search(resetSearch = true) {
+export async function search(resetSearch = true) {
   window.dataLayer = window.dataLayer || [];
 
   if (mobileMediaQuery.matches) {
-    performMobileSearch(resetSearch);
-    return;
+    return performMobileSearch(resetSearch);
   }
 
   searchInput.value = searchInput?.value?.trim() ?? "";
@@ -162,21 +164,24 @@ export function search(resetSearch = true) {
     selectedConvoIds: selectedConvoIds,
   });
 
-  if (getIsLoadingMore()) return;
-  setIsLoadingMore(true);
+  const controller = startSearchRequest(resetSearch);
+  if (!controller) return;
 
   try {
-    const response = searchDialogues(
+    const response = await searchDialogues(
       searchInput.value,
       searchResultLimit,
       getCurrentSearchActorIds(),
       true, // filterStartInput
-      getCurrentSearchOffset(),
+      getCurrentSearchCursor(),
       currentSearchConvoIds, // conversationIds
       showHidden(),
+      controller.signal,
     );
+    if (controller.signal.aborted) return;
 
     const { results: res, total } = response;
+    setCurrentSearchCursor(response.cursor);
     totalResultsCount = total;
     setCurrentSearchTotal(totalResultsCount);
 
@@ -300,14 +305,33 @@ export function search(resetSearch = true) {
       toggleElementVisibility(searchLoader, true);
     }
   } catch (e) {
+    if (e?.name === "AbortError") return;
     console.error("Search error", e);
     if (resetSearch) {
       entryListEl.textContent = "Search error";
     }
   } finally {
-    setIsLoadingMore(false);
-    toggleElementVisibility(searchLoader, false);
+    finishSearchRequest(controller);
+  }
+}
+function startSearchRequest(resetSearch) {
+  // A new search supersedes one still in flight; "load more" waits for the current one
+  if (resetSearch) {
+    searchAbortController?.abort();
+  } else if (getIsLoadingMore()) {
+    return null;
   }
+  const controller = new AbortController();
+  searchAbortController = controller;
+  setIsLoadingMore(true);
+  return controller;
+}
+function finishSearchRequest(controller) {
+  // Only the latest search owns the loading state
+  if (searchAbortController !== controller) return;
+  searchAbortController = null;
+  setIsLoadingMore(false);
+  toggleElementVisibility(searchLoader, false);
 }
 function getQueryTokens(rawQuery) {
   // Helper: tokenize query into quoted phrases and words (approximate DB parsing)
@@ -360,7 +384,7 @@ function filterAndMatchResults(results, rawQuery) {
 
   return filtered;
 }
-function performMobileSearch(resetSearch = true) {
+async function performMobileSearch(resetSearch = true) {
   if (!mobileMediaQuery.matches) return;
   if (!searchInput) return;
   searchInput.value = searchInput.value?.trim();
@@ -395,8 +419,8 @@ function performMobileSearch(resetSearch = true) {
     selectedConvoIds: selectedConvoIds,
   });
 
-  if (getIsLoadingMore()) return;
-  setIsLoadingMore(true);
+  const controller = startSearchRequest(resetSearch);
+  if (!controller) return;
 
   try {
     // Always query without whole-word restriction at DB layer; we'll filter client-side
@@ -413,17 +437,20 @@ function performMobileSearch(resetSearch = true) {
       const convos = getConversationsByType(type, showHidden());
       response = { results: convos, total: convos.length };
     } else {
-      response = searchDialogues(
+      response = await searchDialogues(
         searchInput.value,
         searchResultLimit,
         getCurrentSearchActorIds(),
         true, // filterStartInput
-        getCurrentSearchOffset(),
+        getCurrentSearchCursor(),
         currentSearchConvoIds, // conversationIds
         showHidden(),
+        controller.signal,
       );
+      if (controller.signal.aborted) return;
     }
     const { results, total } = response;
+    setCurrentSearchCursor(response.cursor ?? null);
     // Ensure global total reflects DB/query results for mobile as well
     setCurrentSearchTotal(total);
     // Append to raw results
@@ -496,6 +523,7 @@ function performMobileSearch(resetSearch = true) {
       toggleElementVisibility(searchLoader, true);
     }
   } catch (e) {
+    if (e?.name === "AbortError") return;
     console.error("Mobile search error:", e);
     if (resetSearch) {
       mobileSearchResults.innerHTML =
@@ -503,8 +531,7 @@ function performMobileSearch(resetSearch = true) {
     }
   } finally {
     // Remove any existing loading indicator
-    setIsLoadingMore(false);
-    toggleElementVisibility(searchLoader, false);
+    finishSearchRequest(controller);
   }
 }
 function setSearchCount(value) {
@@ -1,16 +1,34 @@
-import { execRows, execRowsFirstOrDefault } from "./sqlHelpers.js";
+import {
+  columnsToRows,
+  decodeColumn,
+  execRowsFirstOrDefaultAsync,
+  queryAsync,
+} from "./sqlHelpers.js";
 
-export function searchDialogues(
+const EMPTY_RESULT = { columns: [], rowCount: 0, data: [] };
+
+export async function searchDialogues(
   q,
   limit = 1000,
   actorIds = null,
   filterStartInput = true,
-  offset = 0,
+  cursor = null,
   conversationIds = null,
-  showHidden) {
-  // Search dentries table
-  const limitClause = ` LIMIT ${limit} OFFSET ${offset}`;
+  showHidden,
+  signal = null) {
+  // Queries run in the sql worker; aborting `signal` drops any that have not started yet.
+  // Pages use keyset (seek) pagination: each source carries its own cursor and only reads rows after it,
+  // so page N costs the same as page 1. Pass the returned `cursor` back in to get the next page.
+  // Totals are counted on the first page only and carried in the cursor.
+  const isFirstPage = !cursor;
+  cursor = cursor ?? {
+    total: 0,
+    entries: { after: null, done: false },
+    dialogues: { after: null, done: false },
+    alternates: { after: null, done: false },
+  };
 
+  // Search dentries table
   let dentriesWhere = "";
   dentriesWhere = buildEntriesWhereAndLimitClause(
     q,
@@ -20,9 +38,12 @@ export function searchDialogues(
     filterStartInput,
     showHidden
   );
-  const { dentriesCount, dentriesResults } = getEntries(
+  const entriesPromise = getEntries(
     dentriesWhere,
-    limitClause
+    cursor.entries,
+    limit,
+    isFirstPage,
+    signal
   );
 
   // Search dialogues table
@@ -32,9 +53,12 @@ export function searchDialogues(
     conversationIds,
     showHidden
   );
-  const { dialoguesCount, dialoguesResults } = getDialogues(
+  const dialoguesPromise = getDialogues(
     dialoguesWhere,
-    limitClause
+    cursor.dialogues,
+    limit,
+    isFirstPage,
+    signal
   );
 
   // Search alternates table
@@ -44,20 +68,115 @@ export function searchDialogues(
     conversationIds,
     filterStartInput
   );
-  let { alternatesCount, alternatesResults } = getAlternateLines(
+  const alternatesPromise = getAlternateLines(
     alternatesWhere,
-    limitClause
+    cursor.alternates,
+    limit,
+    isFirstPage,
+    signal
   );
 
-  // Calculate total count
-  const totalCount = dentriesCount + dialoguesCount + alternatesCount;
+  const [
+    { dentriesCount, dentriesResults },
+    { dialoguesCount, dialoguesResults },
+    { alternatesCount, alternatesResults },
+  ] = await Promise.all([entriesPromise, dialoguesPromise, alternatesPromise]);
+
+  // Calculate total count once per query
+  const totalCount = isFirstPage
+    ? dentriesCount + dialoguesCount + alternatesCount
+    : cursor.total;
+
+  // Merge the three streams in (conversationid, id) order and keep the first `limit`.
+  // Results stay columnar until the merge, only rows that make the page become objects.
+  const streams = [
+    { source: "entries", result: dentriesResults },
+    { source: "dialogues", result: dialoguesResults },
+    { source: "alternates", result: alternatesResults },
+  ];
+  const results = mergeByKey(streams, limit);
 
-  // Combine results
   return {
-    results: [...dentriesResults, ...dialoguesResults, ...alternatesResults],
+    results,
     total: totalCount,
+    cursor: advanceCursor(cursor, streams, results, limit, totalCount),
   };
 }
+function streamKeys(result, source) {
+  // Sort keys shared by all sources, read from the key columns. Orb/task descriptions (id null)
+  // sort before the conversation's entries, and alternates after the entry they replace.
+  const convoIds = decodeColumn(result, "conversationid");
+  const ids = decodeColumn(result, "id");
+  const alternateIds = decodeColumn(result, "alternateid");
+  return convoIds.map((convoId, i) => [
+    convoId,
+    ids[i] ?? -1,
+    source === "alternates" ? 1 : 0,
+    alternateIds[i] ?? 0,
+  ]);
+}
+function compareKeys(a, b) {
+  for (let i = 0; i < a.length; i++) {
+    if (a[i] !== b[i]) return a[i] < b[i] ? -1 : 1;
+  }
+  return 0;
+}
+function mergeByKey(streams, limit) {
+  const keys = streams.map((stream) => streamKeys(stream.result, stream.source));
+  const positions = streams.map(() => 0);
+  const order = [];
+  while (order.length < limit) {
+    let best = -1;
+    streams.forEach((_, i) => {
+      const key = keys[i][positions[i]];
+      if (!key) return;
+      if (best === -1 || compareKeys(key, keys[best][positions[best]]) < 0) {
+        best = i;
+      }
+    });
+    if (best === -1) break;
+    order.push(best);
+    positions[best]++;
+  }
+
+  // Each stream contributed a prefix of its rows, build just those and interleave them in merge order
+  const rows = streams.map((stream, i) => {
+    const indexes = Array.from({ length: positions[i] }, (_, r) => r);
+    return columnsToRows(stream.result, indexes).map((row) => {
+      row.searchSource = stream.source;
+      if (stream.source === "alternates") row.isAlternate = true;
+      return row;
+    });
+  });
+  const taken = streams.map(() => 0);
+  return order.map((i) => rows[i][taken[i]++]);
+}
+function advanceCursor(cursor, streams, results, limit, total) {
+  // Move each source's cursor past the rows that made it into this page.
+  // Rows fetched but not shown are read again next page, which keeps every page bounded by `limit` per source.
+  const next = { total };
+  for (const { source, result } of streams) {
+    const taken = results.filter((r) => r.searchSource === source);
+    const last = taken.at(-1);
+    next[source] = {
+      after: last ? cursorValues(last, source) : cursor[source].after,
+      done: cursor[source].done || (result.rowCount < limit && taken.length === result.rowCount),
+    };
+  }
+  return next;
+}
+function cursorValues(r, source) {
+  if (source === "dialogues") return [r.conversationid];
+  if (source === "alternates") return [r.conversationid, r.id, r.alternateid];
+  return [r.conversationid, r.id];
+}
+function seekClause(columns, after) {
+  // Row-value comparison lets SQLite seek straight past the cursor on the (conversationid, id) index
+  if (!after) return "";
+  const values = after.map((v) => parseInt(v));
+  if (values.length === 1) return ` AND ${columns[0]} > ${values[0]}`;
+  return ` AND (${columns.join(", ")}) > (${values.join(", ")})`;
+}
 function esc(s) {
   // Escape single quotes
   return s.replace(/'/g, "''");
@@ -281,56 +400,72 @@ function buildDialoguesWhereClause(q, actorIds, conversationIds, showHidden) {
   }
   return dialoguesWhere;
 }
-function getEntries(where, limitClause) {
+async function getEntries(where, cursor, limit, withCount, signal) {
+  if (cursor.done) return { dentriesCount: 0, dentriesResults: EMPTY_RESULT };
   const dentriesCountSQL = `SELECT COUNT(*) as count FROM dentries WHERE ${where};`;
 
   // Search dentries for flow conversations
   const dentriesSQL = `
     SELECT conversationid, id, dialoguetext, title, actor, isHidden 
       FROM dentries 
-      WHERE ${where} 
+      WHERE ${where}${seekClause(["conversationid", "id"], cursor.after)} 
       ORDER BY conversationid, id 
-      ${limitClause};`;
-  const dentriesResults = execRows(dentriesSQL);
-  const dentriesCount = execRowsFirstOrDefault(dentriesCountSQL)?.count || 0;
+      LIMIT ${limit};`;
+  const [dentriesResults, dentriesCountRow] = await Promise.all([
+    queryAsync(dentriesSQL, { signal }),
+    withCount ? execRowsFirstOrDefaultAsync(dentriesCountSQL, { signal }) : null,
+  ]);
+  const dentriesCount = dentriesCountRow?.count || 0;
   return { dentriesCount, dentriesResults };
 }
-function getDialogues(dialoguesWhere, limitClause) {
+async function getDialogues(dialoguesWhere, cursor, limit, withCount, signal) {
+  if (cursor.done) return { dialoguesCount: 0, dialoguesResults: EMPTY_RESULT };
   const dialoguesCountSQL = `SELECT COUNT(*) as count FROM conversations WHERE ${dialoguesWhere};`;
-  const dialoguesCount = execRowsFirstOrDefault(dialoguesCountSQL)?.count || 0;
 
   const dialoguesSQL = `
     SELECT id as conversationid, null as id, description as dialoguetext, title, actor, isHidden 
       FROM conversations 
-      WHERE ${dialoguesWhere} 
-      ORDER BY id 
-      ${limitClause};`;
-  const dialoguesResults = execRows(dialoguesSQL);
+      WHERE ${dialoguesWhere}${seekClause(["id"], cursor.after)} 
+      ORDER BY conversations.id 
+      LIMIT ${limit};`;
+  const [dialoguesCountRow, dialoguesResults] = await Promise.all([
+    withCount ? execRowsFirstOrDefaultAsync(dialoguesCountSQL, { signal }) : null,
+    queryAsync(dialoguesSQL, { signal }),
+  ]);
+  const dialoguesCount = dialoguesCountRow?.count || 0;
   return { dialoguesCount, dialoguesResults };
 }
-function getAlternateLines(alternatesWhere, limitClause) {
+async function getAlternateLines(alternatesWhere, cursor, limit, withCount, signal) {
   // Only query alternates if we have search criteria
-  let alternatesResults = [];
+  let alternatesResults = EMPTY_RESULT;
   let alternatesCount = 0;
-  if (alternatesWhere) {
+  if (alternatesWhere && !cursor.done) {
     // Get count for alternates
     const alternatesCountSQL = `
       SELECT COUNT(*) as count FROM alternates a
       JOIN dentries d ON a.conversationid = d.conversationid AND a.dialogueid = d.id
       WHERE ${alternatesWhere};`;
-    alternatesCount = execRowsFirstOrDefault(alternatesCountSQL)?.count || 0;
-
+    const alternatesCountPromise = withCount
+      ? execRowsFirstOrDefaultAsync(alternatesCountSQL, { signal })
+      : null;
+
+    const seek = seekClause(
+      ["a.conversationid", "a.dialogueid", "a.id"],
+      cursor.after
+    );
     const alternatesSQL = `
-      SELECT a.conversationid, a.dialogueid as id, a.alternateline as dialoguetext, d.title, d.actor, a.condition as alternatecondition
+      SELECT a.conversationid, a.dialogueid as id, a.id as alternateid, a.alternateline as dialoguetext, d.title, d.actor, a.condition as alternatecondition
         FROM alternates a
         JOIN dentries d ON a.conversationid = d.conversationid AND a.dialogueid = d.id
-        WHERE ${alternatesWhere} 
-        ORDER BY a.conversationid, a.dialogueid 
-        ${limitClause};`;
-    alternatesResults = execRows(alternatesSQL).map((r) => ({
-      ...r,
-      isAlternate: true,
-    }));
+        WHERE ${alternatesWhere}${seek} 
+        ORDER BY a.conversationid, a.dialogueid, a.id 
+        LIMIT ${limit};`;
+    const [alternatesCountRow, alternatesRows] = await Promise.all([
+      alternatesCountPromise,
+      queryAsync(alternatesSQL, { signal }),
+    ]);
+    alternatesCount = alternatesCountRow?.count || 0;
+    alternatesResults = alternatesRows;
   }
   return { alternatesCount, alternatesResults };
 }
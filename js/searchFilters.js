@@ -7,13 +7,14 @@ import {
   entryListEl,
   homePageContainer,
   searchInput,
+  searchSuggestionsList,
   selectAllTypes,
   typeCheckboxList,
   wholeWordsCheckbox
 } from "./constants.js";
 import { applyFiltersToCurrentResults, search } from "./search.js";
 import { mobileMediaQuery } from "./constants.js";
-import { getDistinctActors } from "./sqlHelpers.js";
+import { getDistinctActors, getSearchSuggestions } from "./sqlHelpers.js";
 import { getConvos } from "./conversationTree.js";
 import { searchBtn } from "./constants.js";
 import { searchClearBtn } from "./constants.js";
@@ -138,6 +139,7 @@ export function setupClearSearchInput() {
     if (searchInput) {
       const searchClearBtn = e.target;
       searchInput.value = "";
+      updateSearchSuggestions("");
       searchInput.focus();
       // Change icon back to search icon
       toggleElementVisibility(searchClearBtn, false);
@@ -223,12 +225,30 @@ export function setUpSearch() {
       toggleElementVisibility(searchClearBtn, false);
       toggleElementVisibility(searchBtn, true);
     }
+    updateSearchSuggestions(e?.target?.value ?? "");
   }
   searchInput.addEventListener("keydown", handleSearchInputKeyDown);
   searchInput.addEventListener("click", handleSearchInputClick);
   searchInput.addEventListener("input", handleSearchInputEvent);
   searchBtn.addEventListener("click", search);
 }
+export function updateSearchSuggestions(value) {
+  // Offer completions for the word being typed, keeping the rest of the query as-is
+  if (!searchSuggestionsList) return;
+  searchSuggestionsList.innerHTML = "";
+  const match = /^(.*?)("?)([^\s"]*)$/s.exec(value);
+  const [, head, quote, partial] = match;
+  if (partial.length < 2) return;
+
+  const fragment = document.createDocumentFragment();
+  getSearchSuggestions(partial).forEach(({ term }) => {
+    if (term === partial.toLowerCase()) return;
+    const option = document.createElement("option");
+    option.value = `${head}${quote}${term}`;
+    fragment.appendChild(option);
+  });
+  searchSuggestionsList.appendChild(fragment);
+}
 export function triggerSearch(e) {
   e.preventDefault();
 
@@ -97,7 +97,7 @@ export async function showEntryDetails(
   // Fetch alternates, checks, parents/children
   const alternates = coreRow.hasAlts > 0 ? getAlternates(convoId, entryId) : [];
   const checks = coreRow.hasCheck > 0 ? getChecks(convoId, entryId) : [];
-  const { parents, children } = getParentsChildren(convoId, entryId);
+  const { parents, children } = await getParentsChildren(convoId, entryId);
   // Get conversation data
   const convoRow = getConversationById(convoId) || {};
   // Get actor
@@ -1,19 +1,175 @@
+import { loadDatabaseBytes } from "./dbCache.js";
+
 let _db = null;
 let SQL = null;
 
+// Worker copy of the database for heavy queries (search, bulk lookups, tree build)
+let _worker = null;
+let _nextRequestId = 1;
+const _pending = new Map();
+
+// Prepared statements on the main thread copy, created once per SQL string and reused
+const _statements = new Map();
+
+// LRU of helper results keyed by SQL + params. The database is read-only, so entries never go stale.
+const QUERY_CACHE_LIMIT = 500;
+const _queryCache = new Map();
+const _queryCacheStats = { hits: 0, misses: 0 };
+
+// Conversation rows by id. Bounded by the conversations table, which never changes at runtime.
+const _conversationCache = new Map();
+
+// Set once a suggestion lookup fails so the warning is logged only once
+let _suggestionsUnavailable = false;
+
 export async function initDatabase(sqlFactory, path = "db/discobase.sqlite3") {
   // Wraps sql.js Database and provides helper methods, search, and simple caching.
   SQL = sqlFactory;
   try {
-    const res = await fetch(path);
-    if (!res.ok) throw new Error(`Failed to fetch ${path}: ${res.status}`);
-    const buffer = await res.arrayBuffer();
+    const buffer = await loadDatabaseBytes(path);
+    // The main thread keeps its own copy for synchronous point lookups and the worker opens a second one,
+    // so the database is held in memory twice. sql.js copies the bytes into its heap, so the buffer itself
+    // is transferred rather than cloned.
     _db = new SQL.Database(new Uint8Array(buffer));
+    startWorker(buffer);
   } catch (err) {
     console.error("initDatabase error", err);
     throw err;
   }
 }
+function startWorker(buffer) {
+  // Async queries fall back to the main thread copy if workers are unavailable or fail to open
+  if (typeof Worker === "undefined") return;
+  try {
+    _worker = new Worker(new URL("./sqlWorker.js", import.meta.url));
+  } catch (err) {
+    console.error("sqlWorker unavailable, using main thread", err);
+    return;
+  }
+  _worker.onmessage = handleWorkerMessage;
+  _worker.onerror = (err) => {
+    console.error("sqlWorker error, using main thread", err);
+    stopWorker();
+  };
+  postToWorker({ type: "open", buffer }, [buffer]).promise.catch((err) => {
+    console.error("sqlWorker failed to open database, using main thread", err);
+    stopWorker();
+  });
+}
+function stopWorker() {
+  _worker?.terminate();
+  _worker = null;
+  // Anything still waiting on the worker is rerun on the main thread.
+  // The open request has no SQL, the main thread copy is already open.
+  for (const request of _pending.values()) {
+    if (!request.sql) continue;
+    try {
+      request.resolve(toColumns(run(request.sql, request.params)));
+    } catch (err) {
+      request.reject(err);
+    }
+  }
+  _pending.clear();
+}
+function postToWorker(message, transfer = []) {
+  const id = _nextRequestId++;
+  const promise = new Promise((resolve, reject) => {
+    _pending.set(id, { resolve, reject, sql: message.sql, params: message.params });
+    _worker.postMessage({ ...message, id }, transfer);
+  });
+  return { id, promise };
+}
+function handleWorkerMessage(e) {
+  const { id, result, error, cancelled } = e.data;
+  const request = _pending.get(id);
+  if (!request) return;
+  _pending.delete(id);
+  if (cancelled) request.reject(new DOMException("Query cancelled", "AbortError"));
+  else if (error) request.reject(new Error(error));
+  else request.resolve(result);
+}
+export function queryAsync(sql, { params, signal } = {}) {
+  // Run a query in the worker. Resolves to columnar results:
+  // { columns, rowCount, data: [{ kind, data, offsets?, nulls }] }
+  // Pass `params` to bind ? placeholders; the worker reuses a prepared statement per SQL string.
+  if (signal?.aborted) {
+    return Promise.reject(new DOMException("Query cancelled", "AbortError"));
+  }
+  if (!_worker) {
+    return new Promise((resolve) => resolve(toColumns(run(sql, params))));
+  }
+  const { id, promise } = postToWorker({ type: "query", sql, params });
+  signal?.addEventListener(
+    "abort",
+    () => {
+      // Queued queries are dropped by the worker, a running one is just ignored
+      const request = _pending.get(id);
+      if (!request) return;
+      _pending.delete(id);
+      _worker?.postMessage({ type: "cancel", id });
+      request.reject(new DOMException("Query cancelled", "AbortError"));
+    },
+    { once: true },
+  );
+  return promise;
+}
+export async function execRowsAsync(sql, options) {
+  return columnsToRows(await queryAsync(sql, options));
+}
+export async function execRowsFirstOrDefaultAsync(sql, options) {
+  // Remove last character if semicolon
+  if (sql?.at(-1) === ";") {
+    sql = sql.slice(0, -1);
+  }
+  sql += " LIMIT 1;";
+  const values = await execRowsAsync(sql, options);
+  if (values && values.length > 0) {
+    return values[0];
+  }
+  return null;
+}
+export function columnsToRows(result, indexes = null) {
+  // Materialize row objects from a columnar worker result, or only the rows at `indexes`.
+  // Large consumers should read what they need with decodeColumn and build only the rows they keep.
+  const { columns, rowCount, data } = result;
+  const decoder = new TextDecoder();
+  const readers = data.map((col) => columnReader(col, decoder));
+  const picked = indexes ?? Array.from({ length: rowCount }, (_, i) => i);
+  return picked.map((r) => {
+    const o = Object.create(null);
+    for (let c = 0; c < columns.length; c++) o[columns[c]] = readers[c](r);
+    return o;
+  });
+}
+export function decodeColumn(result, name) {
+  // One column of a columnar result as a plain array, null-filled if the column is missing
+  const c = result.columns.indexOf(name);
+  if (c === -1) return new Array(result.rowCount).fill(null);
+  const read = columnReader(result.data[c], new TextDecoder());
+  return Array.from({ length: result.rowCount }, (_, i) => read(i));
+}
+function columnReader(col, decoder) {
+  if (col.kind === "text") {
+    return (i) =>
+      col.nulls[i]
+        ? null
+        : decoder.decode(col.data.subarray(col.offsets[i], col.offsets[i + 1]));
+  }
+  return (i) => (col.nulls[i] ? null : col.data[i]);
+}
+function toColumns(res) {
+  // Main thread fallback: wrap sql.js results in the same shape the worker returns
+  if (!res || !res.length) return { columns: [], rowCount: 0, data: [] };
+  const { columns, values } = res[0];
+  return {
+    columns,
+    rowCount: values.length,
+    data: columns.map((_, c) => {
+      const col = values.map((row) => row[c]);
+      return { kind: "mixed", data: col, nulls: col.map((v) => (v === null ? 1 : 0)) };
+    }),
+  };
+}
 export function execRows(sql) {
   const res = run(sql);
   if (!res || !res.length) return [];
@@ -42,28 +198,48 @@ export function getConversationById(convoId, showHidden) {
   if (!Number.isInteger(convoId)) {
     return;
   }
-  let convoSQL = `SELECT  
-      id, title, onUse, overrideDialogueCondition, alternateOrbText
-      , checkType, condition, instruction
-      , placement, difficulty, description, actor, conversant
-      , displayConditionMain, doneConditionMain, cancelConditionMain, taskReward, taskTimed
-      , type, isHidden, totalEntries, totalSubtasks
-    FROM conversations WHERE `;
-  if (!showHidden) {
-    convoSQL += "isHidden != 1 AND ";
+  if (!convoId) {
+    return;
+  }
+  // Cached per id outside the query LRU: the tree filter and search type filter sweep every conversation
+  let convo = _conversationCache.get(convoId);
+  if (convo === undefined) {
+    convo = runPrepared(
+      `SELECT  
+        id, title, onUse, overrideDialogueCondition, alternateOrbText
+        , checkType, condition, instruction
+        , placement, difficulty, description, actor, conversant
+        , displayConditionMain, doneConditionMain, cancelConditionMain, taskReward, taskTimed
+        , type, isHidden, totalEntries, totalSubtasks
+      FROM conversations WHERE id = ? LIMIT 1;`,
+      [convoId]
+    )[0] ?? null;
+    _conversationCache.set(convoId, convo);
   }
-  convoSQL += `id=${convoId}`;
-  if (convoId) {
-    return execRowsFirstOrDefault(convoSQL);
+  // Same as isHidden != 1 in SQL, a NULL isHidden is not shown either
+  if (convo && !showHidden && (convo.isHidden === null || convo.isHidden == 1)) {
+    return null;
   }
+  return convo;
 }
-export function getAllConversations(showHidden) {
+export async function getAllConversations(showHidden) {
   let q = `SELECT id, title, type FROM conversations `;
   if (!showHidden) {
     q += `WHERE isHidden != 1 `;
   }
   q += `ORDER BY title;`;
-  return execRows(q);
+
+  // Built straight from the columns, this is the largest result the tree asks for
+  const key = cacheKey(q, []);
+  const cached = cacheGet(key);
+  if (cached !== undefined) return cached;
+  const result = await queryAsync(q);
+  const ids = decodeColumn(result, "id");
+  const titles = decodeColumn(result, "title");
+  const types = decodeColumn(result, "type");
+  const convos = ids.map((id, i) => ({ id, title: titles[i], type: types[i] }));
+  cacheSet(key, convos);
+  return convos;
 }
 export function getEntriesForConversation(convoId, showHidden) {
   convoId = parseInt(convoId);
@@ -71,23 +247,23 @@ export function getEntriesForConversation(convoId, showHidden) {
     return;
   }
   if (showHidden) {
-    return execRows(`
+    return queryRows(`
     SELECT id, title, dialoguetext, actor, isHidden
       FROM dentries
-      WHERE conversationid=${convoId}
+      WHERE conversationid = ?
       ORDER BY id;
-  `);
+  `, [convoId]);
   } else {
-    return execRows(`
+    return queryRows(`
     SELECT id, title, dialoguetext, actor, isHidden
       FROM dentries
-      WHERE conversationid=${convoId} AND isHidden != 1
+      WHERE conversationid = ? AND isHidden != 1
       ORDER BY id;
-  `);
+  `, [convoId]);
   }
 }
 export function getDistinctActors() {
-  return execRows(
+  return queryRows(
     `SELECT DISTINCT id, name FROM actors WHERE name IS NOT NULL AND name != '' ORDER BY name;`
   );
 }
@@ -99,12 +275,14 @@ export function getActorNameById(actorId) {
   if (!actorId || actorId === 0) {
     return "";
   }
-  const actor = execRowsFirstOrDefault(
+  const actor = queryRows(
     `SELECT id, name, color
         FROM actors
-        WHERE id='${actorId}'`
+        WHERE id = ?
+        LIMIT 1;`,
+    [actorId]
   );
-  return actor;
+  return actor[0] ?? null;
 }
 export function getEntry(convoId, entryId) {
   entryId = parseInt(entryId);
@@ -112,16 +290,18 @@ export function getEntry(convoId, entryId) {
   if (!Number.isInteger(entryId) || !Number.isInteger(convoId)) {
     return;
   }
-  return execRowsFirstOrDefault(
+  return queryRows(
     `SELECT de.id, de.title, de.dialoguetext, de.actor, de.hasCheck,de.hasAlts
     , de.sequence, de.conditionstring, de.userscript, de.isHidden, c.difficulty as difficultypass
           FROM dentries de
         LEFT JOIN checks c ON c.dialogueid = de.id AND c.conversationid = de.conversationid
         LEFT JOIN modifiers m ON m.dialogueid = de.id AND m.conversationid = de.conversationid
         LEFT JOIN alternates a ON a.dialogueid = de.id AND a.conversationid = de.conversationid
-          WHERE de.conversationid=${convoId} 
-          AND de.id=${entryId}`
-  );
+          WHERE de.conversationid = ?
+          AND de.id = ?
+          LIMIT 1;`,
+    [convoId, entryId]
+  )[0] ?? null;
 }
 export function getAlternates(convoId, entryId) {
   entryId = parseInt(entryId);
@@ -129,11 +309,12 @@ export function getAlternates(convoId, entryId) {
   if (!Number.isInteger(entryId) || !Number.isInteger(convoId)) {
     return;
   }
-  return execRows(
+  return queryRows(
     `SELECT conversationid, dialogueid, alternateline, condition 
       FROM alternates 
-      WHERE conversationid=${convoId} 
-      AND dialogueid=${entryId};`
+      WHERE conversationid = ?
+      AND dialogueid = ?;`,
+    [convoId, entryId]
   );
 }
 export function getChecks(convoId, entryId) {
@@ -142,72 +323,159 @@ export function getChecks(convoId, entryId) {
   if (!Number.isInteger(entryId) || !Number.isInteger(convoId)) {
     return;
   }
-  return execRows(
+  return queryRows(
     `SELECT checktype, difficulty, flagName, forced, a.name
       FROM checks c
 	    LEFT JOIN dentries d ON c.dialogueid = d.id AND c.conversationid = d.conversationid
 	    LEFT JOIN actors a ON a.articyId = c.skilltype
-      WHERE d.conversationid=${convoId} 
-      AND dialogueid=${entryId};`
+      WHERE d.conversationid = ?
+      AND dialogueid = ?;`,
+    [convoId, entryId]
   );
 }
-export function getParentsChildren(convoId, entryId) {
+export async function getParentsChildren(convoId, entryId) {
   entryId = parseInt(entryId);
   convoId = parseInt(convoId);
   if (!Number.isInteger(entryId) || !Number.isInteger(convoId)) {
     return;
   }
-  const parents = execRows(`
+  const [parents, children] = await Promise.all([
+    queryRowsAsync(`
     SELECT originconversationid AS o_convo, origindialogueid AS o_id, priority, isConnector
       FROM dlinks
-      WHERE destinationconversationid=${convoId} 
-      AND destinationdialogueid=${entryId};
-  `);
-  const children = execRows(`
+      WHERE destinationconversationid = ?
+      AND destinationdialogueid = ?;
+  `, [convoId, entryId]),
+    queryRowsAsync(`
     SELECT destinationconversationid AS d_convo, destinationdialogueid AS d_id, priority, isConnector
       FROM dlinks
-      WHERE originconversationid=${convoId} 
-      AND origindialogueid=${entryId};
-  `);
+      WHERE originconversationid = ?
+      AND origindialogueid = ?;
+  `, [convoId, entryId]),
+  ]);
   return { parents, children };
 }
-export function getEntriesBulk(pairs = [], showHidden) {
-  // pairs = [{convo, id}, ...] -> batch by convo to use IN
-  if (!pairs.length) return [];
-  const groupByConvoId = new Map();
+export async function getEntriesBulk(pairs = [], showHidden) {
+  // pairs = [{convoId, entryId}, ...] -> one query matching (conversationid, id) row values
+  const params = [];
   for (const p of pairs) {
-    const entryIds = groupByConvoId.get(p.convoId) || [];
-    entryIds.push(p.entryId);
-    groupByConvoId.set(p.convoId, entryIds);
-  }
-  const results = [];
-  for (const [convoId, entryIds] of groupByConvoId.entries()) {
-    const entryIdList = entryIds.map((i) => String(i)).join(",");
-
-    let query = "SELECT id, title, dialoguetext, actor, isHidden FROM dentries ";
-    query += `WHERE conversationId=${convoId} `;
-    if (!showHidden) {
-      query += `AND isHidden != 1 `;
+    const convoId = parseInt(p.convoId);
+    const entryId = parseInt(p.entryId);
+    if (Number.isInteger(convoId) && Number.isInteger(entryId)) {
+      params.push(convoId, entryId);
     }
+  }
+  if (!params.length) return [];
 
-    query += `AND id IN (${entryIdList});`;
-
-    const rows = execRows(query);
+  const values = Array(params.length / 2).fill("(?, ?)").join(", ");
+  let query = "SELECT conversationid, id, title, dialoguetext, actor, isHidden FROM dentries ";
+  query += `WHERE (conversationid, id) IN (VALUES ${values})`;
+  if (!showHidden) {
+    query += ` AND isHidden != 1`;
+  }
+  query += ";";
 
-    rows.forEach((r) => {
-      results.push({
-        convo: convoId,
-        id: r.id,
-        title: r.title, // Populates Next Dialogue Options title
-        dialoguetext: r.dialoguetext,
-        actor: r.actor,
-      });
-    });
-  }
-  return results;
+  const rows = await queryRowsAsync(query, params);
+  return rows.map((r) => ({
+    convo: r.conversationid,
+    id: r.id,
+    title: r.title, // Populates Next Dialogue Options title
+    dialoguetext: r.dialoguetext,
+    actor: r.actor,
+  }));
+}
+export function getSearchSuggestions(prefix, limit = 8) {
+  // Prefix lookup on the vocabulary table: a range scan on its term primary key.
+  // Not cached, per-keystroke prefixes would push navigation lookups out of the query cache.
+  prefix = (prefix || "").toLowerCase();
+  limit = parseInt(limit);
+  if (!prefix || !Number.isInteger(limit)) {
+    return [];
+  }
+  try {
+    return runPrepared(
+      `SELECT term, frequency
+        FROM vocabulary
+        WHERE term >= ? AND term < ?
+        ORDER BY frequency DESC, term
+        LIMIT ?;`,
+      [prefix, `${prefix}\uffff`, limit]
+    );
+  } catch (err) {
+    // Suggestions are optional, older builds (possibly cached) have no vocabulary table
+    if (!_suggestionsUnavailable) console.warn("Search suggestions unavailable", err);
+    _suggestionsUnavailable = true;
+    return [];
+  }
 }
 
-function run(sql) {
+function run(sql, params) {
   if (!_db) throw new Error("DB not initialized");
-  return _db.exec(sql);
+  return _db.exec(sql, params);
+}
+function runPrepared(sql, params = []) {
+  if (!_db) throw new Error("DB not initialized");
+  let stmt = _statements.get(sql);
+  if (!stmt) {
+    stmt = _db.prepare(sql);
+    _statements.set(sql, stmt);
+  }
+  const rows = [];
+  try {
+    stmt.bind(params);
+    while (stmt.step()) rows.push(stmt.getAsObject());
+  } finally {
+    stmt.reset();
+  }
+  return rows;
+}
+function cacheGet(key) {
+  if (!_queryCache.has(key)) {
+    _queryCacheStats.misses++;
+    return undefined;
+  }
+  // Re-insert to mark as most recently used
+  const value = _queryCache.get(key);
+  _queryCache.delete(key);
+  _queryCache.set(key, value);
+  _queryCacheStats.hits++;
+  return value;
+}
+function cacheSet(key, value) {
+  _queryCache.set(key, value);
+  if (_queryCache.size > QUERY_CACHE_LIMIT) {
+    _queryCache.delete(_queryCache.keys().next().value);
+  }
+}
+function cacheKey(sql, params) {
+  return `${sql}\u0000${JSON.stringify(params)}`;
+}
+function queryRows(sql, params = []) {
+  // Cached prepared query on the main thread copy (point lookups)
+  const key = cacheKey(sql, params);
+  const cached = cacheGet(key);
+  if (cached !== undefined) return cached;
+  const rows = runPrepared(sql, params);
+  cacheSet(key, rows);
+  return rows;
+}
+async function queryRowsAsync(sql, params = []) {
+  // Cached prepared query in the worker (bulk lookups)
+  const key = cacheKey(sql, params);
+  const cached = cacheGet(key);
+  if (cached !== undefined) return cached;
+  const rows = await execRowsAsync(sql, { params });
+  cacheSet(key, rows);
+  return rows;
+}
+export function getQueryCacheStats() {
+  const { hits, misses } = _queryCacheStats;
+  return {
+    hits,
+    misses,
+    hitRate: hits + misses ? hits / (hits + misses) : 0,
+    size: _queryCache.size,
+    conversations: _conversationCache.size,
+    statements: _statements.size,
+  };
 }
\ No newline at end of file
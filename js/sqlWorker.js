@@ -0,0 +1,159 @@
+// Runs sql.js off the main thread. Classic worker so sql-wasm.js can be loaded with importScripts.
+//
+// Messages in:
+//   { type: "open", buffer }           - open the database from an ArrayBuffer (transferred)
+//   { type: "query", id, sql, params } - queue a query, params bind ? placeholders
+//   { type: "cancel", id }             - drop a queued query that has not started yet
+// Messages out:
+//   { id, result } / { id, error } / { id, cancelled: true }
+//
+// Queries run one per task so cancel messages queued behind them are handled in between.
+
+const VENDOR_SQL_JS = "../vendor/sql-wasm/sql-wasm.js";
+const CDN_SQL_JS = "https://cdn.jsdelivr.net/npm/sql.js@1.8.0/dist/sql-wasm.js";
+
+let db = null;
+let ready = null;
+// Prepared statements for parameterized queries, keyed by SQL string
+const statements = new Map();
+const queue = [];
+let draining = false;
+
+function loadSql() {
+  let base = "../vendor/sql-wasm/";
+  try {
+    importScripts(VENDOR_SQL_JS);
+  } catch (err) {
+    console.error(err);
+    importScripts(CDN_SQL_JS);
+    base = "https://cdn.jsdelivr.net/npm/sql.js@1.8.0/dist/";
+  }
+  // eslint-disable-next-line no-undef
+  return initSqlJs({ locateFile: (file) => `${base}${file}` });
+}
+
+function open(buffer) {
+  ready = loadSql().then((SQL) => {
+    db = new SQL.Database(new Uint8Array(buffer));
+  });
+  return ready;
+}
+
+function encodeColumn(values) {
+  // Numbers go into a Float64Array, text into one UTF-8 buffer plus offsets.
+  // Anything else (blobs, mixed types) falls back to a plain array.
+  const nulls = new Uint8Array(values.length);
+  let kind = null;
+  for (let i = 0; i < values.length; i++) {
+    const v = values[i];
+    if (v === null || v === undefined) {
+      nulls[i] = 1;
+      continue;
+    }
+    const vKind = typeof v === "number" ? "number" : typeof v === "string" ? "text" : "mixed";
+    if (kind === null) kind = vKind;
+    else if (kind !== vKind) kind = "mixed";
+  }
+  kind = kind || "number";
+
+  if (kind === "number") {
+    const data = new Float64Array(values.length);
+    for (let i = 0; i < values.length; i++) data[i] = nulls[i] ? 0 : values[i];
+    return { column: { kind, data, nulls }, transfer: [data.buffer, nulls.buffer] };
+  }
+  if (kind === "text") {
+    const encoder = new TextEncoder();
+    const encoded = values.map((v) => (v === null || v === undefined ? new Uint8Array(0) : encoder.encode(v)));
+    const offsets = new Uint32Array(values.length + 1);
+    for (let i = 0; i < encoded.length; i++) offsets[i + 1] = offsets[i] + encoded[i].length;
+    const data = new Uint8Array(offsets[values.length]);
+    for (let i = 0; i < encoded.length; i++) data.set(encoded[i], offsets[i]);
+    return {
+      column: { kind, data, offsets, nulls },
+      transfer: [data.buffer, offsets.buffer, nulls.buffer],
+    };
+  }
+  return { column: { kind, data: values, nulls }, transfer: [nulls.buffer] };
+}
+
+function execValues(sql, params) {
+  // Parameterized SQL is stable, so its statement is prepared once and reused.
+  // Ad hoc SQL (search, values inlined) goes through exec.
+  if (!params) {
+    const res = db.exec(sql);
+    return res && res.length ? res[0] : { columns: [], values: [] };
+  }
+  let stmt = statements.get(sql);
+  if (!stmt) {
+    stmt = db.prepare(sql);
+    statements.set(sql, stmt);
+  }
+  const values = [];
+  try {
+    stmt.bind(params);
+    while (stmt.step()) values.push(stmt.get());
+    return { columns: stmt.getColumnNames(), values };
+  } finally {
+    stmt.reset();
+  }
+}
+
+function runQuery(sql, params) {
+  const { columns, values } = execValues(sql, params);
+  const data = [];
+  const transfer = [];
+  for (let c = 0; c < columns.length; c++) {
+    const encoded = encodeColumn(values.map((row) => row[c]));
+    data.push(encoded.column);
+    transfer.push(...encoded.transfer);
+  }
+  return { result: { columns, rowCount: values.length, data }, transfer };
+}
+
+async function drain() {
+  if (draining) return;
+  draining = true;
+  try {
+    await ready;
+    const next = queue.shift();
+    if (!next) return;
+    try {
+      const { result, transfer } = runQuery(next.sql, next.params);
+      self.postMessage({ id: next.id, result }, transfer);
+    } catch (err) {
+      self.postMessage({ id: next.id, error: String(err?.message || err) });
+    }
+  } catch (err) {
+    // Database failed to open, fail everything that is waiting
+    while (queue.length) {
+      self.postMessage({ id: queue.shift().id, error: String(err?.message || err) });
+    }
+  } finally {
+    draining = false;
+    if (queue.length) setTimeout(drain, 0);
+  }
+}
+
+self.onmessage = (e) => {
+  const msg = e.data;
+  switch (msg.type) {
+    case "open":
+      open(msg.buffer).then(
+        () => self.postMessage({ id: msg.id, result: true }),
+        (err) => self.postMessage({ id: msg.id, error: String(err?.message || err) }),
+      );
+      break;
+    case "query":
+      queue.push(msg);
+      drain();
+      break;
+    case "cancel": {
+      const index = queue.findIndex((q) => q.id === msg.id);
+      if (index !== -1) {
+        queue.splice(index, 1);
+        self.postMessage({ id: msg.id, cancelled: true });
+      }
+      break;
+    }
+  }
+};